@@ -24,9 +24,36 @@ HTTP mode extracts OAuth tokens from the Authorization header, enabling
 per-user credentials in a multi-tenant environment.
 """
 
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+)
+import inspect
+import json
+import logging
 import os
 
 from analytics_mcp.coordinator import mcp
+from analytics_mcp.tools.utils import (
+    proto_to_dict,
+    reset_access_token,
+    set_access_token,
+)
+from google.analytics import data_v1beta
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+import msgspec
+import orjson
+import uvicorn
 
 # The following imports are necessary to register the tools with the `mcp`
 # object, even though they are not directly used in this file.
@@ -34,6 +61,241 @@ from analytics_mcp.tools.admin import info  # noqa: F401
 from analytics_mcp.tools.reporting import realtime  # noqa: F401
 from analytics_mcp.tools.reporting import core  # noqa: F401
 
+# Log calls pass arguments for %-style formatting rather than f-strings, so
+# messages below the configured level are never formatted. Keep it that way,
+# in particular for anything logged while handling a request.
+logger = logging.getLogger(__name__)
+
+
+class MCPRequest(msgspec.Struct):
+    """The body of an MCP request sent to the HTTP bridge."""
+
+    method: str = ""
+    params: Dict[str, Any] = {}
+
+
+class ORJSONResponse(Response):
+    """A JSON response rendered with orjson instead of the stdlib encoder."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content, default=str, option=orjson.OPT_NON_STR_KEYS
+        )
+
+
+# Tools are registered at import time and don't change afterwards, so the
+# tool functions are looked up once and the static responses of the HTTP
+# bridge are serialized once instead of on every request.
+_TOOL_FNS: Dict[str, Callable[..., Awaitable[Any]]] = {
+    tool_name: tool_info.fn
+    for tool_name, tool_info in mcp._tool_manager._tools.items()
+}
+
+_TOOLS_LIST_JSON_BYTES = orjson.dumps(
+    {
+        "tools": [
+            {
+                "name": tool_name,
+                "description": tool_info.description or "",
+                "inputSchema": tool_info.parameters or {},
+            }
+            for tool_name, tool_info in mcp._tool_manager._tools.items()
+        ]
+    }
+)
+
+# Prefix and suffix of a `tools/call` response. The tool result is encoded
+# once and spliced in between as the MCP "text" content, rather than building
+# a wrapper dict and encoding the whole result a second time.
+_TOOLS_CALL_PREFIX = b'{"content":[{"type":"text","text":'
+_TOOLS_CALL_SUFFIX = b"}]}"
+
+# `run_report` results with at least this many rows are streamed to the client
+# in chunks of `_STREAM_CHUNK_ROWS` rows, instead of holding the whole result
+# as a dictionary and as JSON in memory at once.
+_STREAM_MIN_ROWS = 10_000
+_STREAM_CHUNK_ROWS = 1_000
+
+# Signature of the `run_report` tool, used to check the arguments of a call
+# before it's passed to the underlying report method.
+_RUN_REPORT_SIGNATURE = inspect.signature(core.run_report)
+
+_INITIALIZE_JSON_BYTES = orjson.dumps(
+    {
+        "protocolVersion": "2024-11-05",
+        "serverInfo": {"name": "google-analytics-mcp", "version": "0.1.1"},
+        "capabilities": {"tools": {}},
+    }
+)
+
+# Bodies of the error responses that don't depend on the request. Only the
+# bytes are shared: `Response` instances are created per request since
+# middleware such as CORS mutates their headers.
+_ERR_NO_AUTH_JSON_BYTES = orjson.dumps(
+    {"error": "Missing or invalid Authorization header. Use 'Bearer <token>'"}
+)
+_ERR_MISSING_TOOL_NAME_JSON_BYTES = orjson.dumps({"error": "Missing tool name"})
+_ERR_BODY_TOO_LARGE_JSON_BYTES = orjson.dumps(
+    {"error": "Request body too large"}
+)
+
+# Maximum size of an MCP request body. Larger requests are rejected without
+# reading the rest of the body or parsing it.
+_MAX_REQUEST_BODY_BYTES = 1_048_576
+
+
+def _json_bytes_response(content: bytes, status_code: int = 200) -> Response:
+    """Returns a response for an already serialized JSON body."""
+    return Response(
+        content, status_code=status_code, media_type="application/json"
+    )
+
+
+async def _read_body(request: Request) -> Optional[bytes]:
+    """Returns the request body, or None if it exceeds the maximum size.
+
+    Counts the bytes as they're received, so that bodies without a
+    Content-Length header are also bounded.
+    """
+    chunks = []
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > _MAX_REQUEST_BODY_BYTES:
+            return None
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def _dumps_result(result: Any) -> bytes:
+    """Returns the JSON encoding of a tool result.
+
+    Tool results are normally made of JSON types only, so values that need a
+    conversion, if any, are handled by retrying on failure rather than
+    passing options to every call. The retry converts unsupported values and
+    non-string keys to strings. Integers outside the 64-bit range aren't
+    supported by orjson at all, so those fall back to the stdlib encoder.
+    """
+    try:
+        return orjson.dumps(result)
+    except TypeError:
+        pass
+    try:
+        return orjson.dumps(result, default=str, option=orjson.OPT_NON_STR_KEYS)
+    except TypeError:
+        return json.dumps(result, default=str).encode()
+
+
+def _escape_json_text(fragment: bytes) -> bytes:
+    """Returns a fragment of JSON escaped for use inside a JSON string."""
+    return orjson.dumps(fragment.decode())[1:-1]
+
+
+def _encode_rows(rows: List[Dict[str, Any]], first: bool) -> bytes:
+    """Returns the rows as escaped JSON text for a streamed report."""
+    fragment = orjson.dumps(rows)[1:-1]
+    if not first:
+        fragment = b"," + fragment
+    return _escape_json_text(fragment)
+
+
+async def _stream_report(
+    response: data_v1beta.RunReportResponse,
+) -> AsyncIterator[bytes]:
+    """Yields the `tools/call` response for a report in chunks.
+
+    The text content matches the JSON encoding of `proto_to_dict(response)`,
+    except that `rows` is the first key of the report. Clears the rows of
+    `response` once they've been sent.
+
+    The response status has already been sent when this runs, so an error
+    partway through is logged and ends the stream, leaving the body
+    incomplete.
+    """
+    yield _TOOLS_CALL_PREFIX + b'"' + _escape_json_text(b'{"rows":[')
+
+    try:
+        rows = []
+        first = True
+        for row in response.rows:
+            rows.append(proto_to_dict(row))
+            if len(rows) == _STREAM_CHUNK_ROWS:
+                yield _encode_rows(rows, first)
+                rows = []
+                first = False
+        if rows:
+            yield _encode_rows(rows, first)
+
+        # Converts the remaining fields without the rows that were already
+        # sent.
+        del response.rows
+        rest = proto_to_dict(response)
+        rest.pop("rows", None)
+        tail = b"]," + orjson.dumps(rest)[1:] if rest else b"]}"
+        yield _escape_json_text(tail) + b'"' + _TOOLS_CALL_SUFFIX
+    except Exception:
+        logger.exception("Error streaming report")
+
+
+async def _handle_tools_list(params: Dict[str, Any]) -> Response:
+    """Handles the MCP `tools/list` method."""
+    return _json_bytes_response(_TOOLS_LIST_JSON_BYTES)
+
+
+async def _handle_tools_call(params: Dict[str, Any]) -> Response:
+    """Handles the MCP `tools/call` method."""
+    tool_name = params.get("name")
+    arguments = params.get("arguments", {})
+
+    if not tool_name:
+        return _json_bytes_response(
+            _ERR_MISSING_TOOL_NAME_JSON_BYTES, status_code=400
+        )
+
+    # Get the tool function
+    tool_fn = _TOOL_FNS.get(tool_name)
+    if tool_fn is None:
+        return ORJSONResponse(
+            {"error": f"Unknown tool: {tool_name}"}, status_code=404
+        )
+
+    # Call the tool
+    if tool_name == "run_report":
+        # Calls the underlying report method so that large reports can be
+        # streamed instead of converted and serialized in one piece.
+        try:
+            bound = _RUN_REPORT_SIGNATURE.bind(**arguments)
+        except TypeError as e:
+            raise TypeError(f"run_report() {e}") from e
+        response = await core._run_report_raw(*bound.args, **bound.kwargs)
+        if len(response.rows) >= _STREAM_MIN_ROWS:
+            return StreamingResponse(
+                _stream_report(response), media_type="application/json"
+            )
+        result = proto_to_dict(response)
+    else:
+        result = await tool_fn(**arguments)
+
+    text = _dumps_result(result).decode()
+    return _json_bytes_response(
+        _TOOLS_CALL_PREFIX + orjson.dumps(text) + _TOOLS_CALL_SUFFIX
+    )
+
+
+async def _handle_initialize(params: Dict[str, Any]) -> Response:
+    """Handles the MCP `initialize` method."""
+    return _json_bytes_response(_INITIALIZE_JSON_BYTES)
+
+
+# Handlers of the MCP methods supported by the HTTP bridge, keyed by method.
+_METHODS: Dict[str, Callable[[Dict[str, Any]], Awaitable[Response]]] = {
+    "tools/list": _handle_tools_list,
+    "tools/call": _handle_tools_call,
+    "initialize": _handle_initialize,
+}
+
 
 def run_server() -> None:
     """Runs the server in stdio mode.
@@ -54,26 +316,24 @@ def run_http_server() -> None:
     - PORT: HTTP port to listen on (default: 8080)
     - HOST: Host to bind to (default: 0.0.0.0)
     """
-    import json
-    import logging
-    import uvicorn
-    from starlette.applications import Starlette
-    from starlette.responses import JSONResponse, Response
-    from starlette.routing import Route
-    from starlette.middleware import Middleware
-    from starlette.middleware.cors import CORSMiddleware
-
-    from analytics_mcp.tools.utils import set_access_token, clear_access_token
-
+    # FastMCP normally configures the root logger on import, in which case
+    # this is a no-op and its handler formats all logs.
     logging.basicConfig(level=logging.INFO)
-    logger = logging.getLogger(__name__)
 
     port = int(os.environ.get("PORT", "8080"))
     host = os.environ.get("HOST", "0.0.0.0")
 
     async def health(request):
         """Health check endpoint for Cloud Run."""
-        return JSONResponse({"status": "ok"})
+        return ORJSONResponse({"status": "ok"})
+
+    async def mcp_options(request):
+        """Answers OPTIONS requests for the MCP endpoint.
+
+        CORS preflight requests are answered by the CORS middleware; this only
+        handles plain OPTIONS requests, without touching auth or the body.
+        """
+        return Response(status_code=204)
 
     async def mcp_endpoint(request):
         """Handle MCP protocol requests over HTTP.
@@ -93,96 +353,64 @@ def run_http_server() -> None:
             }
         }
         """
+        # Reject bodies that declare a size over the limit before any work.
+        # An unparseable header is left to the bounded read of the body.
+        try:
+            content_length = int(request.headers.get("Content-Length", "0"))
+        except ValueError:
+            content_length = 0
+        if content_length > _MAX_REQUEST_BODY_BYTES:
+            return _json_bytes_response(
+                _ERR_BODY_TOO_LARGE_JSON_BYTES, status_code=413
+            )
+
         # Extract access token from Authorization header
         auth_header = request.headers.get("Authorization", "")
         if not auth_header.startswith("Bearer "):
-            return JSONResponse(
-                {"error": "Missing or invalid Authorization header. Use 'Bearer <token>'"},
-                status_code=401
+            return _json_bytes_response(
+                _ERR_NO_AUTH_JSON_BYTES, status_code=401
             )
 
         access_token = auth_header[7:]  # Remove "Bearer " prefix
 
         # Set the token in context for this request
-        set_access_token(access_token)
+        token = set_access_token(access_token)
 
         try:
-            body = await request.json()
-            method = body.get("method", "")
-            params = body.get("params", {})
-
-            if method == "tools/list":
-                # List available tools
-                tools = []
-                for tool_name, tool_info in mcp._tool_manager._tools.items():
-                    tools.append({
-                        "name": tool_name,
-                        "description": tool_info.description or "",
-                        "inputSchema": tool_info.parameters or {}
-                    })
-                return JSONResponse({"tools": tools})
-
-            elif method == "tools/call":
-                # Call a specific tool
-                tool_name = params.get("name")
-                arguments = params.get("arguments", {})
-
-                if not tool_name:
-                    return JSONResponse(
-                        {"error": "Missing tool name"},
-                        status_code=400
-                    )
-
-                # Get the tool function
-                tool_info = mcp._tool_manager._tools.get(tool_name)
-                if not tool_info:
-                    return JSONResponse(
-                        {"error": f"Unknown tool: {tool_name}"},
-                        status_code=404
-                    )
-
-                # Call the tool
-                import asyncio
-                result = await tool_info.fn(**arguments)
-
-                return JSONResponse({
-                    "content": [{"type": "text", "text": json.dumps(result, default=str)}]
-                })
-
-            elif method == "initialize":
-                # MCP initialization
-                return JSONResponse({
-                    "protocolVersion": "2024-11-05",
-                    "serverInfo": {
-                        "name": "google-analytics-mcp",
-                        "version": "0.1.1"
-                    },
-                    "capabilities": {
-                        "tools": {}
-                    }
-                })
-
-            else:
-                return JSONResponse(
-                    {"error": f"Unknown method: {method}"},
-                    status_code=400
+            raw_body = await _read_body(request)
+            if raw_body is None:
+                return _json_bytes_response(
+                    _ERR_BODY_TOO_LARGE_JSON_BYTES, status_code=413
+                )
+            try:
+                body = msgspec.json.decode(raw_body, type=MCPRequest)
+            except msgspec.DecodeError as e:
+                return ORJSONResponse(
+                    {"error": f"Invalid request body: {e}"}, status_code=400
                 )
+            method = body.method
+            params = body.params
+
+            handler = _METHODS.get(method)
+            if handler is None:
+                return ORJSONResponse(
+                    {"error": f"Unknown method: {method}"}, status_code=400
+                )
+            return await handler(params)
 
         except Exception as e:
             logger.exception("Error handling MCP request")
-            return JSONResponse(
-                {"error": str(e)},
-                status_code=500
-            )
+            return ORJSONResponse({"error": str(e)}, status_code=500)
         finally:
-            # Clear the token after request is processed
-            clear_access_token()
+            # Restore the previous token after request is processed
+            reset_access_token(token)
 
     # Create app with CORS
     app = Starlette(
         routes=[
             Route("/health", health, methods=["GET"]),
-            Route("/mcp", mcp_endpoint, methods=["POST", "OPTIONS"]),
+            Route("/mcp", mcp_endpoint, methods=["POST"]),
+            Route("/mcp", mcp_options, methods=["OPTIONS"]),
         ],
         middleware=[
             Middleware(
@@ -191,14 +419,28 @@ def run_http_server() -> None:
                 allow_methods=["*"],
                 allow_headers=["*"],
             )
-        ]
+        ],
     )
 
-    logger.info(f"Starting HTTP server on {host}:{port}")
-    logger.info(f"Health check: http://{host}:{port}/health")
-    logger.info(f"MCP endpoint: http://{host}:{port}/mcp")
-
-    uvicorn.run(app, host=host, port=port, log_level="info")
+    logger.info("Starting HTTP server on %s:%d", host, port)
+    logger.info("Health check: http://%s:%d/health", host, port)
+    logger.info("MCP endpoint: http://%s:%d/mcp", host, port)
+
+    # uvicorn picks uvloop and httptools, installed with `uvicorn[standard]`,
+    # when they're available and falls back to asyncio and h11 otherwise.
+    #
+    # Access logging formats and writes a line for every request, including
+    # each health check probe, so it's disabled. `log_config=None` keeps
+    # uvicorn from installing its own handlers, so its logs go through the
+    # root logger's handler as well.
+    uvicorn.run(
+        app,
+        host=host,
+        port=port,
+        log_level="info",
+        log_config=None,
+        access_log=False,
+    )
 
 
 def main() -> None:
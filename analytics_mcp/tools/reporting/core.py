@@ -79,6 +79,58 @@ def _run_report_description() -> str:
           """
 
 
+async def _run_report_raw(
+    property_id: int | str,
+    date_ranges: List[Dict[str, Any]],
+    dimensions: List[str],
+    metrics: List[str],
+    dimension_filter: Dict[str, Any] = None,
+    metric_filter: Dict[str, Any] = None,
+    order_bys: List[Dict[str, Any]] = None,
+    limit: int = None,
+    offset: int = None,
+    currency_code: str = None,
+    return_property_quota: bool = False,
+) -> data_v1beta.RunReportResponse:
+    """Runs a Data API report and returns the response message.
+
+    Takes the same arguments as `run_report`, but skips the conversion of the
+    response to a dictionary so that callers can process large responses
+    incrementally.
+    """
+    # Passes plain dicts to a single constructor call instead of building a
+    # proto-plus message per dimension, metric, and date range.
+    request = {
+        "property": construct_property_rn(property_id),
+        "dimensions": [{"name": dimension} for dimension in dimensions],
+        "metrics": [{"name": metric} for metric in metrics],
+        "date_ranges": list(date_ranges),
+        "return_property_quota": return_property_quota,
+    }
+
+    # Empty filters and order-bys mean "none", so they're skipped instead of
+    # being sent as present but empty messages.
+    for field, value in (
+        ("dimension_filter", dimension_filter),
+        ("metric_filter", metric_filter),
+        ("order_bys", order_bys),
+    ):
+        if value:
+            request[field] = value
+    for field, value in (
+        ("limit", limit),
+        ("offset", offset),
+        ("currency_code", currency_code),
+    ):
+        if value is not None:
+            request[field] = value
+
+    response = await create_data_api_client().run_report(
+        data_v1beta.RunReportRequest(request)
+    )
+    return response
+
+
 async def run_report(
     property_id: int | str,
     date_ranges: List[Dict[str, Any]],
@@ -138,38 +190,20 @@ async def run_report(
           report uses the property's default currency.
         return_property_quota: Whether to return property quota in the response.
     """
-    request = data_v1beta.RunReportRequest(
-        property=construct_property_rn(property_id),
-        dimensions=[
-            data_v1beta.Dimension(name=dimension) for dimension in dimensions
-        ],
-        metrics=[data_v1beta.Metric(name=metric) for metric in metrics],
-        date_ranges=[data_v1beta.DateRange(dr) for dr in date_ranges],
+    response = await _run_report_raw(
+        property_id,
+        date_ranges,
+        dimensions,
+        metrics,
+        dimension_filter=dimension_filter,
+        metric_filter=metric_filter,
+        order_bys=order_bys,
+        limit=limit,
+        offset=offset,
+        currency_code=currency_code,
         return_property_quota=return_property_quota,
     )
 
-    if dimension_filter:
-        request.dimension_filter = data_v1beta.FilterExpression(
-            dimension_filter
-        )
-
-    if metric_filter:
-        request.metric_filter = data_v1beta.FilterExpression(metric_filter)
-
-    if order_bys:
-        request.order_bys = [
-            data_v1beta.OrderBy(order_by) for order_by in order_bys
-        ]
-
-    if limit:
-        request.limit = limit
-    if offset:
-        request.offset = offset
-    if currency_code:
-        request.currency_code = currency_code
-
-    response = await create_data_api_client().run_report(request)
-
     return proto_to_dict(response)
 
 
@@ -17,14 +17,18 @@
 Modified to support per-request OAuth tokens for multi-user deployments.
 """
 
-from contextvars import ContextVar
-from typing import Any, Dict, Optional
+from collections import OrderedDict
+from contextvars import ContextVar, Token
+from typing import Any, Callable, Dict, Optional, TypeVar
 
 from google.analytics import admin_v1beta, data_v1beta, admin_v1alpha
 from google.api_core.gapic_v1.client_info import ClientInfo
 from google.oauth2.credentials import Credentials
+from google.protobuf.json_format import MessageToDict, MessageToJson
 from importlib import metadata
+import functools
 import google.auth
+import hashlib
 import proto
 
 
@@ -40,9 +44,11 @@ def _get_package_version_with_fallback():
 
 
 # Client information that adds a custom user agent to all API requests.
-_CLIENT_INFO = ClientInfo(
-    user_agent=f"analytics-mcp/{_get_package_version_with_fallback()}"
-)
+# Resolving the package version scans the installed distributions, so both are
+# computed once at import and shared by every client. Don't recompute them per
+# request.
+_USER_AGENT = f"analytics-mcp/{_get_package_version_with_fallback()}"
+_CLIENT_INFO = ClientInfo(user_agent=_USER_AGENT)
 
 # Read-only scope for Analytics Admin API and Analytics Data API.
 _READ_ONLY_ANALYTICS_SCOPE = (
@@ -56,12 +62,13 @@ _current_access_token: ContextVar[Optional[str]] = ContextVar(
 )
 
 
-def set_access_token(token: str) -> None:
+def set_access_token(token: str) -> Token:
     """Sets the access token for the current request context.
 
-    Call this at the start of each request to set the user's OAuth token.
+    Call this at the start of each request to set the user's OAuth token, and
+    pass the returned token to `reset_access_token` once the request is done.
     """
-    _current_access_token.set(token)
+    return _current_access_token.set(token)
 
 
 def get_access_token() -> Optional[str]:
@@ -69,9 +76,94 @@ def get_access_token() -> Optional[str]:
     return _current_access_token.get()
 
 
-def clear_access_token() -> None:
-    """Clears the access token for the current request context."""
-    _current_access_token.set(None)
+def reset_access_token(token: Token) -> None:
+    """Restores the access token that was set before `set_access_token`."""
+    _current_access_token.reset(token)
+
+
+# Maximum number of API clients cached per client type. Clients hold a gRPC
+# channel, so they're reused across requests that present the same access
+# token (or across all requests when using Application Default Credentials)
+# instead of being created for every tool call.
+_MAX_CACHED_CLIENTS = 256
+
+# Options for the gRPC channels of API clients. While a call is in flight,
+# keepalive pings every 30 seconds detect a dead connection instead of waiting
+# on the call's deadline, including during long reports that receive no data
+# for a while. Pings aren't sent while a channel has no active calls, which
+# keeps idle cached clients within the ping rate Google front ends accept.
+# The message size limits are the defaults of the generated transports.
+_GRPC_CHANNEL_OPTIONS = [
+    ("grpc.max_send_message_length", -1),
+    ("grpc.max_receive_message_length", -1),
+    ("grpc.keepalive_time_ms", 30000),
+    ("grpc.keepalive_timeout_ms", 10000),
+    ("grpc.http2.max_pings_without_data", 0),
+]
+
+_ClientT = TypeVar("_ClientT")
+
+_admin_api_clients: "OrderedDict[Optional[bytes], Any]" = OrderedDict()
+_data_api_clients: "OrderedDict[Optional[bytes], Any]" = OrderedDict()
+_admin_alpha_api_clients: "OrderedDict[Optional[bytes], Any]" = OrderedDict()
+
+# Maximum number of OAuth credentials cached by access token, so that a token
+# presented on many requests maps to a single `Credentials` object.
+_MAX_CACHED_CREDENTIALS = 1024
+
+_credentials_cache: "OrderedDict[bytes, Credentials]" = OrderedDict()
+
+
+def _token_cache_key(token: Optional[str]) -> Optional[bytes]:
+    """Returns a cache key for an access token.
+
+    Uses a digest of the token so that raw tokens aren't retained as cache
+    keys. Returns None when no token is set, i.e. for ADC.
+    """
+    if not token:
+        return None
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def _create_grpc_transport(client_class: Any, **kwargs: Any) -> Any:
+    """Returns an async gRPC transport for the client class.
+
+    Creates the transport's channel with `_GRPC_CHANNEL_OPTIONS`. Any other
+    arguments are passed to the transport by the client.
+    """
+    transport_class = client_class.get_transport_class("grpc_asyncio")
+
+    def create_channel(host: str, **channel_kwargs: Any) -> Any:
+        channel_kwargs["options"] = _GRPC_CHANNEL_OPTIONS
+        return transport_class.create_channel(host, **channel_kwargs)
+
+    return transport_class(channel=create_channel, **kwargs)
+
+
+def _get_or_create_client(
+    cache: "OrderedDict[Optional[bytes], _ClientT]",
+    client_class: Callable[..., _ClientT],
+) -> _ClientT:
+    """Returns the cached client for the current access token.
+
+    Creates the client on a cache miss and evicts the least recently used
+    client once the cache holds more than `_MAX_CACHED_CLIENTS` entries.
+    """
+    key = _token_cache_key(get_access_token())
+    client = cache.get(key)
+    if client is not None:
+        cache.move_to_end(key)
+        return client
+
+    client = client_class(
+        client_info=_CLIENT_INFO,
+        credentials=_create_credentials(),
+        transport=functools.partial(_create_grpc_transport, client_class),
+    )
+    cache[key] = client
+    if len(cache) > _MAX_CACHED_CLIENTS:
+        cache.popitem(last=False)
+    return client
 
 
 def _create_credentials() -> google.auth.credentials.Credentials:
@@ -89,10 +181,19 @@ def _create_credentials() -> google.auth.credentials.Credentials:
 
     if token:
         # Use the provided OAuth token
-        return Credentials(
-            token=token,
-            scopes=[_READ_ONLY_ANALYTICS_SCOPE]
+        key = _token_cache_key(token)
+        credentials = _credentials_cache.get(key)
+        if credentials is not None:
+            _credentials_cache.move_to_end(key)
+            return credentials
+
+        credentials = Credentials(
+            token=token, scopes=[_READ_ONLY_ANALYTICS_SCOPE]
         )
+        _credentials_cache[key] = credentials
+        if len(_credentials_cache) > _MAX_CACHED_CREDENTIALS:
+            _credentials_cache.popitem(last=False)
+        return credentials
 
     # Fall back to Application Default Credentials
     credentials, _ = google.auth.default(scopes=[_READ_ONLY_ANALYTICS_SCOPE])
@@ -102,20 +203,22 @@ def _create_credentials() -> google.auth.credentials.Credentials:
 def create_admin_api_client() -> admin_v1beta.AnalyticsAdminServiceAsyncClient:
     """Returns a properly configured Google Analytics Admin API async client.
 
-    Uses OAuth token from context if available, otherwise ADC.
+    Uses OAuth token from context if available, otherwise ADC. Clients are
+    cached per token.
     """
-    return admin_v1beta.AnalyticsAdminServiceAsyncClient(
-        client_info=_CLIENT_INFO, credentials=_create_credentials()
+    return _get_or_create_client(
+        _admin_api_clients, admin_v1beta.AnalyticsAdminServiceAsyncClient
     )
 
 
 def create_data_api_client() -> data_v1beta.BetaAnalyticsDataAsyncClient:
     """Returns a properly configured Google Analytics Data API async client.
 
-    Uses OAuth token from context if available, otherwise ADC.
+    Uses OAuth token from context if available, otherwise ADC. Clients are
+    cached per token.
     """
-    return data_v1beta.BetaAnalyticsDataAsyncClient(
-        client_info=_CLIENT_INFO, credentials=_create_credentials()
+    return _get_or_create_client(
+        _data_api_clients, data_v1beta.BetaAnalyticsDataAsyncClient
     )
 
 
@@ -124,45 +227,71 @@ def create_admin_alpha_api_client() -> (
 ):
     """Returns a properly configured Google Analytics Admin API (alpha) async client.
 
-    Uses OAuth token from context if available, otherwise ADC.
+    Uses OAuth token from context if available, otherwise ADC. Clients are
+    cached per token.
     """
-    return admin_v1alpha.AnalyticsAdminServiceAsyncClient(
-        client_info=_CLIENT_INFO, credentials=_create_credentials()
+    return _get_or_create_client(
+        _admin_alpha_api_clients, admin_v1alpha.AnalyticsAdminServiceAsyncClient
     )
 
 
-def construct_property_rn(property_value: int | str) -> str:
-    """Returns a property resource name in the format required by APIs."""
-    property_num = None
-    if isinstance(property_value, int):
-        property_num = property_value
-    elif isinstance(property_value, str):
-        property_value = property_value.strip()
-        if property_value.isdigit():
-            property_num = int(property_value)
-        elif property_value.startswith("properties/"):
-            numeric_part = property_value.split("/")[-1]
-            if numeric_part.isdigit():
-                property_num = int(numeric_part)
-    if property_num is None:
-        raise ValueError(
-            (
-                f"Invalid property ID: {property_value}. "
-                "A valid property value is either a number or a string starting "
-                "with 'properties/' and followed by a number."
-            )
+def _invalid_property_id_error(property_value: Any) -> ValueError:
+    """Returns the error raised for an invalid property ID."""
+    return ValueError(
+        (
+            f"Invalid property ID: {property_value}. "
+            "A valid property value is either a number or a string starting "
+            "with 'properties/' and followed by a number."
         )
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def _construct_property_rn_from_str(property_value: str) -> str:
+    """Returns the property resource name for a string property ID."""
+    numeric_part = property_value.strip().removeprefix("properties/")
+    if numeric_part.isdigit():
+        return f"properties/{int(numeric_part)}"
+    raise _invalid_property_id_error(property_value)
 
-    return f"properties/{property_num}"
+
+def construct_property_rn(property_value: int | str) -> str:
+    """Returns a property resource name in the format required by APIs.
+
+    Parsed string values are cached. Other types are checked before the
+    cache lookup since they may not be hashable.
+    """
+    if type(property_value) is int:
+        return f"properties/{property_value}"
+    if isinstance(property_value, str):
+        return _construct_property_rn_from_str(property_value)
+    raise _invalid_property_id_error(property_value)
 
 
 def proto_to_dict(obj: proto.Message) -> Dict[str, Any]:
-    """Converts a proto message to a dictionary."""
-    return type(obj).to_dict(
-        obj, use_integers_for_enums=False, preserving_proto_field_name=True
+    """Converts a proto message to a dictionary.
+
+    Converts the underlying protobuf message directly rather than going
+    through proto-plus, using the same options as `proto.Message.to_dict`.
+    """
+    return MessageToDict(
+        type(obj).pb(obj),
+        use_integers_for_enums=False,
+        preserving_proto_field_name=True,
+        always_print_fields_with_no_presence=True,
     )
 
 
 def proto_to_json(obj: proto.Message) -> str:
-    """Converts a proto message to a JSON string."""
-    return type(obj).to_json(obj, indent=None, preserving_proto_field_name=True)
+    """Converts a proto message to a JSON string.
+
+    Converts the underlying protobuf message directly rather than going
+    through proto-plus, using the same options as `proto.Message.to_json`.
+    """
+    return MessageToJson(
+        type(obj).pb(obj),
+        use_integers_for_enums=True,
+        indent=None,
+        preserving_proto_field_name=True,
+        always_print_fields_with_no_presence=True,
+    )
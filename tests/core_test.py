@@ -0,0 +1,79 @@
+# Copyright 2025 Google LLC All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the core reporting module."""
+
+from unittest import mock
+import asyncio
+import unittest
+
+from analytics_mcp.tools.reporting import core
+from google.analytics import data_v1beta
+
+
+class TestCore(unittest.TestCase):
+    """Test cases for the core reporting module."""
+
+    def _run_report_request(self, **kwargs):
+        """Runs a report with a fake client and returns the request sent."""
+        requests = []
+
+        class FakeClient:
+            async def run_report(self, request):
+                requests.append(request)
+                return data_v1beta.RunReportResponse()
+
+        with mock.patch.object(
+            core, "create_data_api_client", return_value=FakeClient()
+        ):
+            asyncio.run(
+                core._run_report_raw(
+                    property_id=12345,
+                    date_ranges=[
+                        {"start_date": "7daysAgo", "end_date": "today"}
+                    ],
+                    dimensions=["country"],
+                    metrics=["activeUsers"],
+                    **kwargs,
+                )
+            )
+        return data_v1beta.RunReportRequest.pb(requests[0])
+
+    def test_run_report_skips_empty_filters(self):
+        """Tests that empty filters and order-bys aren't sent."""
+        request = self._run_report_request(
+            dimension_filter={}, metric_filter={}, order_bys=[], limit=0
+        )
+        self.assertFalse(request.HasField("dimension_filter"))
+        self.assertFalse(request.HasField("metric_filter"))
+        self.assertEqual(len(request.order_bys), 0)
+        self.assertEqual(request.limit, 0)
+        self.assertEqual(request.property, "properties/12345")
+
+    def test_run_report_sets_filters(self):
+        """Tests that non-empty filters and order-bys are sent."""
+        request = self._run_report_request(
+            dimension_filter={
+                "filter": {
+                    "field_name": "country",
+                    "string_filter": {"value": "US"},
+                }
+            },
+            order_bys=[{"metric": {"metric_name": "activeUsers"}}],
+            limit=10,
+        )
+        self.assertTrue(request.HasField("dimension_filter"))
+        self.assertFalse(request.HasField("metric_filter"))
+        self.assertEqual(len(request.order_bys), 1)
+        self.assertEqual(request.limit, 10)
@@ -14,8 +14,15 @@
 
 """Test cases for the server module."""
 
+from unittest import mock
+import asyncio
+import datetime
+import decimal
+import json
 import unittest
 
+from google.analytics import data_v1beta
+
 
 class TestUtils(unittest.TestCase):
     """Test cases for the server module."""
@@ -29,3 +36,143 @@ class TestUtils(unittest.TestCase):
         from analytics_mcp import server
 
         self.assertIsNotNone(server.mcp, "MCP server instance not initialized")
+
+    def test_method_handlers(self):
+        """Tests the handlers of the MCP methods supported over HTTP."""
+        from analytics_mcp import server
+
+        response = asyncio.run(server._METHODS["tools/list"]({}))
+        tool_names = [
+            tool["name"] for tool in json.loads(response.body)["tools"]
+        ]
+        self.assertIn("run_report", tool_names)
+
+        response = asyncio.run(server._METHODS["tools/call"]({}))
+        self.assertEqual(response.status_code, 400)
+
+        response = asyncio.run(
+            server._METHODS["tools/call"]({"name": "no_such_tool"})
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_stream_report(self):
+        """Tests that a streamed report matches the non-streamed result."""
+        from analytics_mcp import server
+
+        def make_response():
+            return data_v1beta.RunReportResponse(
+                dimension_headers=[{"name": "country"}],
+                rows=[
+                    {"dimension_values": [{"value": f'"country {i}"'}]}
+                    for i in range(25)
+                ],
+                row_count=25,
+            )
+
+        async def read_body(response):
+            stream = server._stream_report(response)
+            return b"".join([chunk async for chunk in stream])
+
+        with mock.patch.object(server, "_STREAM_CHUNK_ROWS", 10):
+            body = asyncio.run(read_body(make_response()))
+        text = json.loads(body)["content"][0]["text"]
+        self.assertEqual(
+            json.loads(text), server.proto_to_dict(make_response())
+        )
+
+    def test_stream_report_error(self):
+        """Tests that an error while streaming a report is logged."""
+        from analytics_mcp import server
+
+        response = data_v1beta.RunReportResponse(
+            rows=[{"dimension_values": [{"value": "US"}]}], row_count=1
+        )
+
+        async def read_body():
+            stream = server._stream_report(response)
+            return b"".join([chunk async for chunk in stream])
+
+        with mock.patch.object(
+            server, "proto_to_dict", side_effect=ValueError("bad row")
+        ):
+            with self.assertLogs(server.logger, level="ERROR") as logs:
+                body = asyncio.run(read_body())
+        self.assertIn("Error streaming report", logs.output[0])
+        self.assertTrue(body.startswith(server._TOOLS_CALL_PREFIX))
+        self.assertFalse(body.endswith(server._TOOLS_CALL_SUFFIX))
+
+    def test_run_report_argument_error(self):
+        """Tests that invalid run_report arguments name the public tool."""
+        from analytics_mcp import server
+
+        with self.assertRaisesRegex(TypeError, r"^run_report\(\) missing"):
+            asyncio.run(
+                server._METHODS["tools/call"](
+                    {"name": "run_report", "arguments": {}}
+                )
+            )
+        with self.assertRaisesRegex(TypeError, r"^run_report\(\) got an"):
+            asyncio.run(
+                server._METHODS["tools/call"](
+                    {
+                        "name": "run_report",
+                        "arguments": {
+                            "property_id": 1,
+                            "date_ranges": [],
+                            "dimensions": [],
+                            "metrics": [],
+                            "no_such_argument": 1,
+                        },
+                    }
+                )
+            )
+
+    def test_dumps_result(self):
+        """Tests that tool results with non-JSON types are still encoded."""
+        from analytics_mcp import server
+
+        self.assertEqual(
+            server._dumps_result({"a": [1, "b"]}), b'{"a":[1,"b"]}'
+        )
+        self.assertEqual(
+            server._dumps_result(
+                {"d": datetime.date(2025, 1, 2), "n": decimal.Decimal("1.5")}
+            ),
+            b'{"d":"2025-01-02","n":"1.5"}',
+        )
+        self.assertEqual(server._dumps_result({1: "a"}), b'{"1":"a"}')
+        self.assertEqual(server._dumps_result([2**70]), b"[%d]" % 2**70)
+
+    def _create_test_client(self):
+        """Returns a test client for the app of the HTTP server."""
+        from analytics_mcp import server
+        from starlette.testclient import TestClient
+
+        with mock.patch.object(server.uvicorn, "run") as run:
+            server.run_http_server()
+        return TestClient(run.call_args.args[0])
+
+    def test_request_body_too_large(self):
+        """Tests that request bodies over the size limit are rejected."""
+        from analytics_mcp import server
+
+        client = self._create_test_client()
+        headers = {"Authorization": "Bearer token"}
+        body = b'{"method": "initialize", "params": {"padding": "%s"}}' % (
+            b"a" * server._MAX_REQUEST_BODY_BYTES
+        )
+
+        response = client.post("/mcp", content=body, headers=headers)
+        self.assertEqual(response.status_code, 413)
+
+        def chunks():
+            for start in range(0, len(body), 65536):
+                yield body[start : start + 65536]
+
+        response = client.post("/mcp", content=chunks(), headers=headers)
+        self.assertEqual(response.status_code, 413)
+
+        response = client.post(
+            "/mcp", json={"method": "initialize"}, headers=headers
+        )
+        self.assertEqual(response.status_code, 200)
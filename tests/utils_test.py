@@ -14,9 +14,12 @@
 
 """Test cases for the utils module."""
 
+from collections import OrderedDict
+from unittest import mock
 import unittest
 
 from analytics_mcp.tools import utils
+from google.analytics import data_v1beta
 
 
 class TestUtils(unittest.TestCase):
@@ -68,3 +71,109 @@ class TestUtils(unittest.TestCase):
             msg="Resource name with more than 2 components should fail",
         ):
             utils.construct_property_rn("properties/123/abc")
+        with self.assertRaises(
+            ValueError,
+            msg="Resource name with more than 2 numeric components should fail",
+        ):
+            utils.construct_property_rn("properties/123/456")
+        with self.assertRaises(ValueError, msg="Boolean should fail"):
+            utils.construct_property_rn(True)
+        with self.assertRaises(ValueError, msg="List should fail"):
+            utils.construct_property_rn([12345])
+        with self.assertRaises(ValueError, msg="Dict should fail"):
+            utils.construct_property_rn({"id": 12345})
+
+    def test_reset_access_token(self):
+        """Tests that reset_access_token restores the previous token."""
+        self.assertIsNone(utils.get_access_token())
+        outer = utils.set_access_token("outer")
+        inner = utils.set_access_token("inner")
+        self.assertEqual(utils.get_access_token(), "inner")
+        utils.reset_access_token(inner)
+        self.assertEqual(utils.get_access_token(), "outer")
+        utils.reset_access_token(outer)
+        self.assertIsNone(utils.get_access_token())
+
+    def test_get_or_create_client(self):
+        """Tests that clients are cached per access token."""
+
+        class FakeClient:
+            def __init__(self, client_info, credentials, transport):
+                self.credentials = credentials
+
+        cache = OrderedDict()
+        token = utils.set_access_token("token-a")
+        try:
+            client_a = utils._get_or_create_client(cache, FakeClient)
+            self.assertIs(
+                utils._get_or_create_client(cache, FakeClient),
+                client_a,
+                "Same token should reuse the cached client",
+            )
+            self.assertEqual(client_a.credentials.token, "token-a")
+            utils.set_access_token("token-b")
+            self.assertIsNot(
+                utils._get_or_create_client(cache, FakeClient),
+                client_a,
+                "Different token should create a new client",
+            )
+            self.assertEqual(len(cache), 2)
+        finally:
+            utils.reset_access_token(token)
+
+    def test_proto_to_dict_matches_proto_plus(self):
+        """Tests that proto_to_dict and proto_to_json match proto-plus."""
+        response = data_v1beta.RunReportResponse(
+            dimension_headers=[{"name": "country"}],
+            metric_headers=[{"name": "activeUsers", "type_": "TYPE_INTEGER"}],
+            rows=[
+                {
+                    "dimension_values": [{"value": "US"}],
+                    "metric_values": [{"value": "10"}],
+                }
+            ],
+            row_count=1,
+        )
+        self.assertEqual(
+            utils.proto_to_dict(response),
+            data_v1beta.RunReportResponse.to_dict(
+                response,
+                use_integers_for_enums=False,
+                preserving_proto_field_name=True,
+            ),
+        )
+        self.assertEqual(
+            utils.proto_to_json(response),
+            data_v1beta.RunReportResponse.to_json(
+                response, indent=None, preserving_proto_field_name=True
+            ),
+        )
+
+    def test_create_credentials_cached_by_token(self):
+        """Tests that OAuth credentials are reused for the same token."""
+        token = utils.set_access_token("token-a")
+        try:
+            credentials = utils._create_credentials()
+            self.assertEqual(credentials.token, "token-a")
+            self.assertIs(utils._create_credentials(), credentials)
+            utils.set_access_token("token-b")
+            self.assertEqual(utils._create_credentials().token, "token-b")
+        finally:
+            utils.reset_access_token(token)
+
+    def test_get_or_create_client_uses_shared_client_info(self):
+        """Tests that clients share the client info computed at import."""
+
+        class FakeClient:
+            def __init__(self, client_info, credentials, transport):
+                self.client_info = client_info
+
+        token = utils.set_access_token("token-a")
+        try:
+            with mock.patch.object(utils.metadata, "version") as version:
+                client = utils._get_or_create_client(OrderedDict(), FakeClient)
+            version.assert_not_called()
+            self.assertIs(client.client_info, utils._CLIENT_INFO)
+            self.assertEqual(utils._CLIENT_INFO.user_agent, utils._USER_AGENT)
+        finally:
+            utils.reset_access_token(token)